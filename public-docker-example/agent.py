@@ -13,6 +13,7 @@ from livekit.agents import (
     Agent,
     AgentSession,
     JobContext,
+    JobProcess,
     RoomOutputOptions,
     WorkerOptions,
     WorkerType,
@@ -26,6 +27,10 @@ logger.setLevel(logging.INFO)
 load_dotenv()
 
 AVATAR_MODE = os.getenv("AVATAR_MODE", "cpu").lower()  # "cpu" or "gpu"
+AGENT_INSTRUCTIONS = (
+    "You are a helpful assistant. Talk to me! "
+    "Respond shortly and concisely."
+)
 
 
 def _build_avatar_session() -> bithuman.AvatarSession:
@@ -74,9 +79,13 @@ def _build_avatar_session() -> bithuman.AvatarSession:
     )
 
 
+def prewarm(proc: JobProcess):
+    """Load the VAD once per worker process so every job can reuse it."""
+    proc.userdata["vad"] = silero.VAD.load()
+
+
 async def entrypoint(ctx: JobContext):
     await ctx.connect()
-    await ctx.wait_for_participant()
 
     logger.info("starting bitHuman avatar")
     avatar = _build_avatar_session()
@@ -86,18 +95,15 @@ async def entrypoint(ctx: JobContext):
             voice=os.getenv("OPENAI_VOICE", "coral"),
             model="gpt-4o-mini-realtime-preview",
         ),
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
     )
 
+    # Bring up the avatar (model load) while the user is still joining
     await avatar.start(session, room=ctx.room)
+    await ctx.wait_for_participant()
 
     await session.start(
-        agent=Agent(
-            instructions=(
-                "You are a helpful assistant. Talk to me! "
-                "Respond shortly and concisely."
-            )
-        ),
+        agent=Agent(instructions=AGENT_INSTRUCTIONS),
         room=ctx.room,
         room_output_options=RoomOutputOptions(audio_enabled=False),
     )
@@ -107,6 +113,7 @@ if __name__ == "__main__":
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
             worker_type=WorkerType.ROOM,
             job_memory_warn_mb=3000 if AVATAR_MODE == "gpu" else 1500,
             num_idle_processes=1,
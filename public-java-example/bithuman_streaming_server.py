@@ -22,6 +22,8 @@ import signal
 import struct
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 from loguru import logger
@@ -32,6 +34,21 @@ except ImportError:
     logger.error("websockets is required: pip install websockets")
     sys.exit(1)
 
+try:
+    from turbojpeg import TJFLAG_FASTDCT, TJPF_BGR, TJSAMP_420, TurboJPEG
+except ImportError:
+    TurboJPEG = None  # optional: libjpeg-turbo encoder, falls back to OpenCV
+
+try:
+    from nvjpeg import NvJpeg
+except ImportError:
+    NvJpeg = None  # optional: CUDA nvJPEG encoder, only used with --jpeg-backend nvjpeg
+
+try:
+    import uvloop  # optional: lower per-callback overhead than the default loop
+except ImportError:
+    uvloop = None
+
 from bithuman import AsyncBithuman
 from bithuman.utils import FPSController
 
@@ -41,20 +58,92 @@ logger.add(sys.stdout, level="INFO")
 TAG_VIDEO = 0x01
 TAG_AUDIO = 0x02
 TAG_END_OF_SPEECH = 0x03
+# Binary message headers (see README.md); each ends with a float64 timestamp
+VIDEO_HEADER = struct.Struct("!BHHfId")  # tag, width, height, fps, jpeg size, timestamp
+AUDIO_HEADER = struct.Struct("!BIBId")   # tag, sample rate, channels, pcm size, timestamp
+END_OF_SPEECH_MESSAGE = struct.pack("!B", TAG_END_OF_SPEECH)
 JPEG_QUALITY = 80
+BACKLOG_JPEG_QUALITY = 60  # used while any client is falling behind, to shrink frames
+AUDIO_QUEUE_SIZE = 20  # 2 s of 100 ms input chunks; older audio is dropped past this
+CLIENT_QUEUE_SIZE = 50  # ~1 s of video + audio messages buffered per client
+CLIENT_HIGH_WATER = CLIENT_QUEUE_SIZE // 2  # past this, a client skips video frames
+CLIENT_LAG_THRESHOLD = CLIENT_HIGH_WATER // 2  # any client past this lowers JPEG quality
+
+
+class ClientOutbox:
+    """Per-client send buffer; pushing onto a full buffer drops the oldest message."""
+
+    def __init__(self, maxlen: int):
+        self.messages: deque[bytes | bytearray] = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+
+    def push(self, data: bytes | bytearray) -> None:
+        self.messages.append(data)
+        self.ready.set()
+
+
+def _load_nvjpeg():
+    """Return an nvJPEG encoder; the nvjpeg backend is explicit, so failures are fatal."""
+    if NvJpeg is None:
+        raise RuntimeError("--jpeg-backend nvjpeg requires: pip install pynvjpeg")
+    try:
+        return NvJpeg()
+    except Exception as e:
+        raise RuntimeError(f"nvJPEG could not be initialized: {e}") from e
+
+
+def _load_turbojpeg(backend: str):
+    """Return a TurboJPEG encoder, or None to encode with OpenCV."""
+    if backend == "opencv":
+        return None
+    if TurboJPEG is None:
+        if backend == "turbojpeg":
+            raise RuntimeError("--jpeg-backend turbojpeg requires: pip install PyTurboJPEG")
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        if backend == "turbojpeg":
+            raise RuntimeError(f"libjpeg-turbo could not be loaded: {e}") from e
+        logger.warning(f"libjpeg-turbo not available, using OpenCV JPEG encoder: {e}")
+        return None
+
+
+def load_jpeg_encoders(backend: str) -> tuple:
+    """Resolve a --jpeg-backend choice to (nvjpeg, turbojpeg); both None means OpenCV.
+
+    Raises RuntimeError when an explicitly requested backend is unavailable.
+    """
+    if backend == "nvjpeg":
+        return _load_nvjpeg(), None
+    return None, _load_turbojpeg(backend)
 
 
 class BithumanStreamingServer:
     """Wraps AsyncBithuman and serves audio-in / video-out over WebSocket."""
 
-    def __init__(self, runtime: AsyncBithuman, host: str = "0.0.0.0", port: int = 8765):
+    def __init__(
+        self, runtime: AsyncBithuman, host: str = "0.0.0.0", port: int = 8765,
+        jpeg_encoders: tuple | None = None,
+    ):
         self.runtime = runtime
         self.host = host
         self.port = port
-        self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=AUDIO_QUEUE_SIZE)
         self._clients: dict[str, websockets.WebSocketServerProtocol] = {}
+        self._outboxes: dict[str, ClientOutbox] = {}
         self._running = False
         self._fps = FPSController(target_fps=25)
+        self._connected_message = json.dumps({
+            "type": "connected",
+            "message": "bitHuman streaming server ready",
+            "audio_format": {"sample_rate": 16000, "channels": 1, "encoding": "int16_le", "chunk_ms": 100},
+            "video_format": {"codec": "jpeg", "fps": 25},
+        })
+        # (nvjpeg, turbojpeg) from load_jpeg_encoders(); main() resolves them before model load
+        self._nvjpeg, self._turbojpeg = jpeg_encoders or load_jpeg_encoders("auto")
+        # Encoding runs off the event loop; one worker since frames are encoded in order
+        self._encode_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jpeg-encode")
 
     async def start(self) -> None:
         self._running = True
@@ -62,6 +151,7 @@ class BithumanStreamingServer:
         self._ws_server = await websockets.serve(
             self._on_client_connect, self.host, self.port,
             ping_interval=30, ping_timeout=10, max_size=2**20,
+            compression=None,  # JPEG/PCM payloads gain nothing from permessage-deflate
         )
         logger.info(f"WebSocket server listening on ws://{self.host}:{self.port}")
         self._audio_task = asyncio.create_task(self._pump_audio())
@@ -80,32 +170,52 @@ class BithumanStreamingServer:
         for ws in list(self._clients.values()):
             await ws.close()
         await self.runtime.stop()
+        self._encode_pool.shutdown(wait=False)
         logger.info("Server stopped")
 
     async def _on_client_connect(self, websocket, path=None):
         cid = str(id(websocket))
-        self._clients[cid] = websocket
         logger.info(f"Client {cid} connected from {websocket.remote_address}")
 
-        await websocket.send(json.dumps({
-            "type": "connected",
-            "message": "bitHuman streaming server ready",
-            "audio_format": {"sample_rate": 16000, "channels": 1, "encoding": "int16_le", "chunk_ms": 100},
-            "video_format": {"codec": "jpeg", "fps": 25},
-        }))
+        await websocket.send(self._connected_message)
+
+        outbox = ClientOutbox(CLIENT_QUEUE_SIZE)
+        self._clients[cid] = websocket
+        self._outboxes[cid] = outbox
+        writer = asyncio.create_task(self._write_client(websocket, outbox))
 
         try:
             async for message in websocket:
                 if isinstance(message, bytes):
-                    await self._audio_queue.put(message)
+                    self._queue_audio(message)
                 elif isinstance(message, str):
                     await self._handle_json(message)
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
             self._clients.pop(cid, None)
+            self._outboxes.pop(cid, None)
+            writer.cancel()
             logger.info(f"Client {cid} disconnected")
 
+    async def _write_client(self, websocket, outbox: ClientOutbox) -> None:
+        """Drain one client's outbox so slow peers only stall themselves."""
+        try:
+            while True:
+                await outbox.ready.wait()
+                outbox.ready.clear()
+                while outbox.messages:
+                    await websocket.send(outbox.messages.popleft())
+        except (asyncio.CancelledError, websockets.exceptions.ConnectionClosed):
+            pass
+
+    def _queue_audio(self, audio_bytes: bytes) -> None:
+        """Queue client audio, dropping the oldest chunk if the runtime has fallen behind."""
+        if self._audio_queue.full():
+            self._audio_queue.get_nowait()
+            logger.warning("Audio input backlog full, dropping oldest chunk")
+        self._audio_queue.put_nowait(audio_bytes)
+
     async def _handle_json(self, raw: str) -> None:
         try:
             msg = json.loads(raw)
@@ -125,15 +235,34 @@ class BithumanStreamingServer:
         while self._running:
             try:
                 audio_bytes = await self._audio_queue.get()
+                if not self._audio_queue.empty():
+                    # Merge any backlog into a single push
+                    merged = bytearray(audio_bytes)
+                    while not self._audio_queue.empty():
+                        merged += self._audio_queue.get_nowait()
+                    audio_bytes = bytes(merged)
                 await self.runtime.push_audio(audio_bytes, 16000, last_chunk=False)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Audio pump error: {e}")
+                await asyncio.sleep(0.1)  # back off instead of hammering a failing runtime
+
+    def _encode_jpeg(self, bgr_image, quality: int) -> memoryview:
+        if self._nvjpeg is not None:
+            return memoryview(self._nvjpeg.encode(bgr_image, quality))
+        if self._turbojpeg is not None:
+            # 4:2:0 like OpenCV's default; PyTurboJPEG would otherwise use 4:2:2
+            return memoryview(self._turbojpeg.encode(
+                bgr_image, quality=quality, pixel_format=TJPF_BGR,
+                jpeg_subsample=TJSAMP_420, flags=TJFLAG_FASTDCT,
+            ))
+        _, jpeg = cv2.imencode(".jpg", bgr_image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return memoryview(jpeg).cast("B")  # flat view of the encoder's array, no copy
 
     async def _pump_video(self) -> None:
         """Encode runtime output as binary frames and broadcast to clients."""
-        encode_params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+        loop = asyncio.get_running_loop()
 
         try:
             async for frame in self.runtime.run():
@@ -145,42 +274,65 @@ class BithumanStreamingServer:
                     self._fps.update()
                     continue
 
-                if frame.has_image:
-                    _, jpeg = cv2.imencode(".jpg", frame.bgr_image, encode_params)
-                    jpeg_bytes = jpeg.tobytes()
+                ts = time.time()  # one timestamp shared by this frame's video and audio
+
+                # Skip the encode entirely when every client is too backed up to take a frame
+                if frame.has_image and self._video_wanted():
+                    quality = BACKLOG_JPEG_QUALITY if self._clients_lagging() else JPEG_QUALITY
+                    jpeg = await loop.run_in_executor(
+                        self._encode_pool, self._encode_jpeg, frame.bgr_image, quality,
+                    )
                     h, w = frame.bgr_image.shape[:2]
-                    ts = time.time()
-                    header = struct.pack("!BHHfI", TAG_VIDEO, w, h, self._fps.average_fps, len(jpeg_bytes))
-                    header += struct.pack("!d", ts)
-                    await self._broadcast(header + jpeg_bytes)
+                    # Header and JPEG share one buffer: a single allocation and copy per frame
+                    packet = bytearray(VIDEO_HEADER.size + len(jpeg))
+                    VIDEO_HEADER.pack_into(packet, 0, TAG_VIDEO, w, h, self._fps.average_fps, len(jpeg), ts)
+                    packet[VIDEO_HEADER.size:] = jpeg
+                    self._broadcast(packet, droppable=True)
 
                 if frame.audio_chunk is not None:
-                    pcm_bytes = frame.audio_chunk.array.tobytes()
-                    ts = time.time()
-                    header = struct.pack("!BIBI", TAG_AUDIO, frame.audio_chunk.sample_rate, 1, len(pcm_bytes))
-                    header += struct.pack("!d", ts)
-                    await self._broadcast(header + pcm_bytes)
+                    pcm = memoryview(frame.audio_chunk.array).cast("B")
+                    packet = bytearray(AUDIO_HEADER.size + len(pcm))
+                    AUDIO_HEADER.pack_into(packet, 0, TAG_AUDIO, frame.audio_chunk.sample_rate, 1, len(pcm), ts)
+                    packet[AUDIO_HEADER.size:] = pcm
+                    self._broadcast(packet)
 
                 if frame.end_of_speech:
-                    await self._broadcast(struct.pack("!B", TAG_END_OF_SPEECH))
+                    self._broadcast(END_OF_SPEECH_MESSAGE)
 
                 self._fps.update()
 
         except asyncio.CancelledError:
             pass
 
-    async def _broadcast(self, data: bytes) -> None:
-        dead = []
-        for cid, ws in self._clients.items():
-            try:
-                await ws.send(data)
-            except Exception:
-                dead.append(cid)
-        for cid in dead:
-            self._clients.pop(cid, None)
+    def _video_wanted(self) -> bool:
+        return any(len(outbox.messages) < CLIENT_HIGH_WATER for outbox in self._outboxes.values())
+
+    def _clients_lagging(self) -> bool:
+        """True while any client's backlog is deep enough to encode at BACKLOG_JPEG_QUALITY."""
+        return any(
+            len(outbox.messages) >= CLIENT_LAG_THRESHOLD for outbox in self._outboxes.values()
+        )
+
+    def _broadcast(self, data: bytes | bytearray, droppable: bool = False) -> None:
+        """Queue one payload for every client, dropping its oldest message when full.
+
+        Droppable payloads (video) skip clients that are already past the high-water
+        mark, leaving their remaining room for audio.
+        """
+        for outbox in self._outboxes.values():
+            if droppable and len(outbox.messages) >= CLIENT_HIGH_WATER:
+                continue
+            outbox.push(data)
 
 
 async def main(args: argparse.Namespace) -> None:
+    # Check the encoder first so a missing package fails before the slow model load
+    try:
+        jpeg_encoders = load_jpeg_encoders(args.jpeg_backend)
+    except RuntimeError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
     runtime = await AsyncBithuman.create(
         model_path=args.model, api_secret=args.api_secret,
         token=args.token, insecure=args.insecure,
@@ -188,7 +340,9 @@ async def main(args: argparse.Namespace) -> None:
     frame_size = runtime.get_frame_size()
     logger.info(f"Model loaded — frame size {frame_size[0]}x{frame_size[1]}")
 
-    server = BithumanStreamingServer(runtime, host=args.host, port=args.port)
+    server = BithumanStreamingServer(
+        runtime, host=args.host, port=args.port, jpeg_encoders=jpeg_encoders,
+    )
     await server.start()
 
     loop = asyncio.get_running_loop()
@@ -211,9 +365,15 @@ if __name__ == "__main__":
     parser.add_argument("--host", type=str, default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8765)
     parser.add_argument("--insecure", action="store_true")
+    parser.add_argument("--jpeg-backend", choices=["auto", "turbojpeg", "opencv", "nvjpeg"], default="auto",
+                        help="JPEG encoder (auto: libjpeg-turbo if installed, else OpenCV; "
+                             "nvjpeg: NVIDIA GPU)")
 
     args = parser.parse_args()
     assert args.model, "Model path required (--model or BITHUMAN_MODEL_PATH env)"
     assert args.api_secret or args.token, "API secret or token required"
 
-    asyncio.run(main(args))
+    if uvloop is not None:
+        uvloop.run(main(args))
+    else:
+        asyncio.run(main(args))
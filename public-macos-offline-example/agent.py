@@ -12,6 +12,7 @@ from livekit.agents import (
     Agent,
     AgentSession,
     JobContext,
+    JobProcess,
     WorkerOptions,
     WorkerType,
     cli,
@@ -28,11 +29,19 @@ IMX_MODEL_ROOT = os.getenv("IMX_MODEL_ROOT", "/imx-models")
 APPLE_SPEECH_URL = os.getenv("APPLE_SPEECH_URL", "http://host.docker.internal:8000/v1")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://host.docker.internal:11434/v1")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:1b")
+AGENT_INSTRUCTIONS = (
+    "You are a helpful assistant. Talk to me! "
+    "Respond shortly and concisely."
+)
+
+
+def prewarm(proc: JobProcess):
+    """Load the VAD once per worker process so every job can reuse it."""
+    proc.userdata["vad"] = silero.VAD.load()
 
 
 async def entrypoint(ctx: JobContext):
     await ctx.connect()
-    await ctx.wait_for_participant()
 
     models = sorted(Path(IMX_MODEL_ROOT).glob("*.imx"))
     if not models:
@@ -50,18 +59,15 @@ async def entrypoint(ctx: JobContext):
         stt=openai.STT(base_url=APPLE_SPEECH_URL, language="en"),
         llm=openai.LLM.with_ollama(model=OLLAMA_MODEL, base_url=OLLAMA_URL),
         tts=openai.TTS(base_url=APPLE_SPEECH_URL, voice=""),
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
     )
 
+    # Bring up the avatar (model load) while the user is still joining
     await avatar.start(session, room=ctx.room)
+    await ctx.wait_for_participant()
 
     await session.start(
-        agent=Agent(
-            instructions=(
-                "You are a helpful assistant. Talk to me! "
-                "Respond shortly and concisely."
-            )
-        ),
+        agent=Agent(instructions=AGENT_INSTRUCTIONS),
         room=ctx.room,
         room_options=RoomOptions(audio_output=False),
     )
@@ -71,6 +77,7 @@ if __name__ == "__main__":
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
             worker_type=WorkerType.ROOM,
             job_memory_warn_mb=1500,
             num_idle_processes=1,
@@ -7,7 +7,6 @@ Usage:
 import argparse
 import asyncio
 import os
-import threading
 
 import cv2
 import numpy as np
@@ -16,29 +15,63 @@ import sounddevice as sd
 from bithuman import AsyncBithuman
 from bithuman.audio import float32_to_int16, load_audio
 
-# Thread-safe audio buffer
-audio_buf = bytearray()
-audio_lock = threading.Lock()
+try:
+    import uvloop  # optional: lower per-callback overhead than the default loop
+except ImportError:
+    uvloop = None
+
+
+class AudioRingBuffer:
+    """Fixed-size int16 FIFO between the frame loop and the speaker callback.
+
+    Single producer / single consumer: each side only advances its own
+    counter, so the realtime audio thread never takes a lock or allocates.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        assert capacity & (capacity - 1) == 0, "capacity must be a power of two"
+        self._buf = np.zeros(capacity, dtype=np.int16)
+        self._mask = capacity - 1
+        self._written = 0  # advanced by the writer only
+        self._read = 0     # advanced by the reader only
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, dropping whatever does not fit."""
+        n = min(len(samples), len(self._buf) - (self._written - self._read))
+        start = self._written & self._mask
+        first = min(n, len(self._buf) - start)
+        self._buf[start : start + first] = samples[:first]
+        self._buf[: n - first] = samples[first:n]
+        self._written += n
+
+    def read_into(self, out: np.ndarray) -> None:
+        """Fill `out` with buffered samples, zero-padding on underrun."""
+        n = min(len(out), self._written - self._read)
+        start = self._read & self._mask
+        first = min(n, len(self._buf) - start)
+        out[:first] = self._buf[start : start + first]
+        out[first:n] = self._buf[: n - first]
+        out[n:] = 0
+        self._read += n
+
+
+audio_buf = AudioRingBuffer()
 
 
 def audio_callback(outdata, frames, _time, _status):
     """Feed buffered audio to the speaker."""
-    n_bytes = frames * 2  # int16 = 2 bytes per sample
-    with audio_lock:
-        available = min(len(audio_buf), n_bytes)
-        outdata[:available // 2, 0] = np.frombuffer(audio_buf[:available], dtype=np.int16)
-        outdata[available // 2:, 0] = 0
-        del audio_buf[:available]
+    audio_buf.read_into(outdata[:, 0])
 
 
 async def push_audio(runtime: AsyncBithuman, audio_file: str):
     """Stream audio to the runtime in small chunks (simulates real-time input)."""
-    audio_np, sr = load_audio(audio_file)
-    audio_np = float32_to_int16(audio_np)
+    # Decoding/resampling the file is blocking; keep it off the frame loop
+    audio_np, sr = await asyncio.to_thread(load_audio, audio_file)
+    audio_bytes = float32_to_int16(audio_np).tobytes()
 
-    chunk_size = sr // 100  # 10ms chunks
-    for i in range(0, len(audio_np), chunk_size):
-        await runtime.push_audio(audio_np[i : i + chunk_size].tobytes(), sr, last_chunk=False)
+    chunk_bytes = sr // 10 * 2  # 100ms chunks of int16
+    for i in range(0, len(audio_bytes), chunk_bytes):
+        await runtime.push_audio(audio_bytes[i : i + chunk_bytes], sr, last_chunk=False)
 
     await runtime.flush()
 
@@ -70,9 +103,8 @@ async def main():
                 if cv2.waitKey(1) & 0xFF == ord("q"):
                     break
 
-            if frame.audio_chunk:
-                with audio_lock:
-                    audio_buf.extend(frame.audio_chunk.array.tobytes())
+            if frame.audio_chunk is not None:
+                audio_buf.write(frame.audio_chunk.array)
     finally:
         audio_task.cancel()
         speaker.stop()
@@ -81,4 +113,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
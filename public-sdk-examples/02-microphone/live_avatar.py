@@ -12,7 +12,6 @@ import argparse
 import asyncio
 import os
 import sys
-import threading
 
 import cv2
 import numpy as np
@@ -23,6 +22,11 @@ from loguru import logger
 from bithuman import AsyncBithuman
 from bithuman.utils import FPSController
 
+try:
+    import uvloop  # optional: lower per-callback overhead than the default loop
+except ImportError:
+    uvloop = None
+
 load_dotenv()
 logger.remove()
 logger.add(sys.stdout, level="INFO")
@@ -32,6 +36,40 @@ MIC_CHUNK = 160       # 10ms at 16kHz
 SILENCE_TIMEOUT = 3.0  # seconds of silence before draining stale audio
 
 
+class AudioRingBuffer:
+    """Fixed-size int16 FIFO between the frame loop and the speaker callback.
+
+    Single producer / single consumer: each side only advances its own
+    counter, so the realtime audio thread never takes a lock or allocates.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        assert capacity & (capacity - 1) == 0, "capacity must be a power of two"
+        self._buf = np.zeros(capacity, dtype=np.int16)
+        self._mask = capacity - 1
+        self._written = 0  # advanced by the writer only
+        self._read = 0     # advanced by the reader only
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, dropping whatever does not fit."""
+        n = min(len(samples), len(self._buf) - (self._written - self._read))
+        start = self._written & self._mask
+        first = min(n, len(self._buf) - start)
+        self._buf[start : start + first] = samples[:first]
+        self._buf[: n - first] = samples[first:n]
+        self._written += n
+
+    def read_into(self, out: np.ndarray) -> None:
+        """Fill `out` with buffered samples, zero-padding on underrun."""
+        n = min(len(out), self._written - self._read)
+        start = self._read & self._mask
+        first = min(n, len(self._buf) - start)
+        out[:first] = self._buf[start : start + first]
+        out[first:n] = self._buf[: n - first]
+        out[n:] = 0
+        self._read += n
+
+
 async def read_and_push_audio(
     runtime: AsyncBithuman,
     audio_queue: asyncio.Queue,
@@ -39,11 +77,22 @@ async def read_and_push_audio(
     silent_threshold_db: int = -40,
 ):
     """Read mic audio from queue and push to bitHuman runtime with silence detection."""
-    last_speech_time = asyncio.get_running_loop().time()
+    loop = asyncio.get_running_loop()
+    last_speech_time = loop.time()
+    # Scratch buffers for level and volume math, reused for every mic block
+    scaled = np.empty(MIC_CHUNK, dtype=np.float32)
+    scaled_int16 = np.empty(MIC_CHUNK, dtype=np.int16)
 
     while True:
-        audio_data, rms_db = await audio_queue.get()
-        now = asyncio.get_running_loop().time()
+        audio_data = await audio_queue.get()
+        now = loop.time()
+
+        samples = np.frombuffer(audio_data, dtype=np.int16)
+        n = len(samples)
+        np.copyto(scaled[:n], samples)
+        # One pass with no squared temporary
+        rms = np.sqrt(np.dot(scaled[:n], scaled[:n]) / n) / 32767
+        rms_db = 20 * np.log10(rms + 1e-9)
 
         if rms_db > silent_threshold_db:
             last_speech_time = now
@@ -51,11 +100,14 @@ async def read_and_push_audio(
             # Drain stale audio when silent too long
             while audio_queue.qsize() > 10:
                 audio_queue.get_nowait()
+            # Nothing to animate: let the runtime idle instead of feeding it silence
+            continue
 
         if volume != 1.0:
-            samples = np.frombuffer(audio_data, dtype=np.int16)
-            samples = np.clip(samples * volume, -32768, 32767).astype(np.int16)
-            audio_data = samples.tobytes()
+            np.multiply(scaled[:n], volume, out=scaled[:n])
+            np.clip(scaled[:n], -32768, 32767, out=scaled[:n])
+            np.copyto(scaled_int16[:n], scaled[:n], casting="unsafe")
+            audio_data = scaled_int16[:n].tobytes()
 
         await runtime.push_audio(audio_data, SAMPLE_RATE, last_chunk=False)
 
@@ -82,28 +134,18 @@ async def main():
 
     loop = asyncio.get_running_loop()
     audio_queue: asyncio.Queue = asyncio.Queue()
-    speaker_buf = bytearray()
-    speaker_lock = threading.Lock()
+    speaker_buf = AudioRingBuffer()
 
     def mic_callback(indata, frames, time_info, status):
-        """Sounddevice callback: convert float32 mic input to int16, compute dB."""
-        samples = indata[:, 0].copy()
-        int16 = (samples * 32767).astype(np.int16)
-        rms = np.sqrt(np.mean(samples ** 2))
-        db = 20 * np.log10(rms + 1e-9)
-        asyncio.run_coroutine_threadsafe(audio_queue.put((int16.tobytes(), db)), loop)
+        """Sounddevice callback: hand the int16 block to the event loop."""
+        loop.call_soon_threadsafe(audio_queue.put_nowait, bytes(indata))
 
     def speaker_callback(outdata, frames, time_info, status):
         """Sounddevice callback: drain buffered avatar audio to speakers."""
-        n_bytes = frames * 2  # int16 = 2 bytes per sample
-        with speaker_lock:
-            avail = min(len(speaker_buf), n_bytes)
-            outdata[:avail // 2, 0] = np.frombuffer(speaker_buf[:avail], dtype=np.int16)
-            outdata[avail // 2:, 0] = 0
-            del speaker_buf[:avail]
+        speaker_buf.read_into(outdata[:, 0])
 
     mic_stream = sd.InputStream(
-        samplerate=SAMPLE_RATE, channels=1, dtype="float32",
+        samplerate=SAMPLE_RATE, channels=1, dtype="int16",
         blocksize=MIC_CHUNK, callback=mic_callback,
     )
     speaker_stream = None
@@ -134,9 +176,8 @@ async def main():
                 if cv2.waitKey(1) & 0xFF == ord("q"):
                     break
 
-            if args.echo and frame.audio_chunk:
-                with speaker_lock:
-                    speaker_buf.extend(frame.audio_chunk.array.tobytes())
+            if speaker_stream is not None and frame.audio_chunk is not None:
+                speaker_buf.write(frame.audio_chunk.array)
 
             fps.update()
     finally:
@@ -149,4 +190,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -8,11 +8,9 @@ Usage:
 """
 
 import asyncio
-import base64
 import logging
 import os
 import sys
-import threading
 
 import cv2
 import numpy as np
@@ -23,6 +21,16 @@ from openai import AsyncOpenAI
 
 from bithuman import AsyncBithuman
 
+try:
+    import pybase64 as base64  # optional: SIMD drop-in for the stdlib codec
+except ImportError:
+    import base64
+
+try:
+    import uvloop  # optional: lower per-callback overhead than the default loop
+except ImportError:
+    uvloop = None
+
 load_dotenv()
 logger.remove()
 logger.add(sys.stdout, level="INFO")
@@ -31,6 +39,41 @@ logging.getLogger("numba").setLevel(logging.WARNING)
 OPENAI_SAMPLE_RATE = 24000  # OpenAI Realtime requires 24kHz PCM16
 AVATAR_SAMPLE_RATE = 16000  # bitHuman outputs at 16kHz
 MIC_CHUNK = 240             # 10ms at 24kHz
+MIC_BATCH_MAX = 10          # coalesce up to 100ms of backlog per send
+
+
+class AudioRingBuffer:
+    """Fixed-size int16 FIFO between the frame loop and the speaker callback.
+
+    Single producer / single consumer: each side only advances its own
+    counter, so the realtime audio thread never takes a lock or allocates.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        assert capacity & (capacity - 1) == 0, "capacity must be a power of two"
+        self._buf = np.zeros(capacity, dtype=np.int16)
+        self._mask = capacity - 1
+        self._written = 0  # advanced by the writer only
+        self._read = 0     # advanced by the reader only
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, dropping whatever does not fit."""
+        n = min(len(samples), len(self._buf) - (self._written - self._read))
+        start = self._written & self._mask
+        first = min(n, len(self._buf) - start)
+        self._buf[start : start + first] = samples[:first]
+        self._buf[: n - first] = samples[first:n]
+        self._written += n
+
+    def read_into(self, out: np.ndarray) -> None:
+        """Fill `out` with buffered samples, zero-padding on underrun."""
+        n = min(len(out), self._written - self._read)
+        start = self._read & self._mask
+        first = min(n, len(self._buf) - start)
+        out[:first] = self._buf[start : start + first]
+        out[first:n] = self._buf[: n - first]
+        out[n:] = 0
+        self._read += n
 
 
 async def main():
@@ -52,25 +95,18 @@ async def main():
     loop = asyncio.get_running_loop()
     mic_queue: asyncio.Queue[bytes] = asyncio.Queue()
     ai_audio_queue: asyncio.Queue[bytes | None] = asyncio.Queue()
-    speaker_buf = bytearray()
-    speaker_lock = threading.Lock()
+    speaker_buf = AudioRingBuffer()
 
     def mic_callback(indata, frames, time_info, status):
-        """Convert float32 mic input to int16 PCM and enqueue."""
-        samples = (indata[:, 0] * 32767).astype(np.int16)
-        asyncio.run_coroutine_threadsafe(mic_queue.put(samples.tobytes()), loop)
+        """Enqueue int16 PCM mic input (PortAudio does the sample conversion)."""
+        loop.call_soon_threadsafe(mic_queue.put_nowait, bytes(indata))
 
     def speaker_callback(outdata, frames, time_info, status):
         """Drain buffered avatar audio to speakers."""
-        n_bytes = frames * 2
-        with speaker_lock:
-            avail = min(len(speaker_buf), n_bytes)
-            outdata[:avail // 2, 0] = np.frombuffer(speaker_buf[:avail], dtype=np.int16)
-            outdata[avail // 2:, 0] = 0
-            del speaker_buf[:avail]
+        speaker_buf.read_into(outdata[:, 0])
 
     mic_stream = sd.InputStream(
-        samplerate=OPENAI_SAMPLE_RATE, channels=1, dtype="float32",
+        samplerate=OPENAI_SAMPLE_RATE, channels=1, dtype="int16",
         blocksize=MIC_CHUNK, callback=mic_callback,
     )
     speaker_stream = sd.OutputStream(
@@ -96,7 +132,11 @@ async def main():
 
             async def send_mic():
                 while True:
-                    data = await mic_queue.get()
+                    chunks = [await mic_queue.get()]
+                    # Fold any backlog into one append instead of one event per 10 ms
+                    while len(chunks) < MIC_BATCH_MAX and not mic_queue.empty():
+                        chunks.append(mic_queue.get_nowait())
+                    data = b"".join(chunks)
                     await conn.input_audio_buffer.append(audio=base64.b64encode(data).decode())
 
             send_task = asyncio.create_task(send_mic())
@@ -128,9 +168,8 @@ async def main():
                 if cv2.waitKey(1) & 0xFF == ord("q"):
                     break
 
-            if frame.audio_chunk:
-                with speaker_lock:
-                    speaker_buf.extend(frame.audio_chunk.array.tobytes())
+            if frame.audio_chunk is not None:
+                speaker_buf.write(frame.audio_chunk.array)
     finally:
         openai_task.cancel()
         bithuman_task.cancel()
@@ -141,4 +180,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -7,9 +7,12 @@ Usage:
     python webrtc_agent.py dev
 """
 
+import asyncio
 import logging
 import os
 from collections.abc import AsyncGenerator, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 
 import cv2
 import numpy as np
@@ -40,19 +43,25 @@ class BithumanVideoGenerator(VideoGenerator):
 
     def __init__(self, runtime: AsyncBithuman):
         self._runtime = runtime
-
-    @property
+        self._frame_buf: np.ndarray | None = None  # reused color-conversion target
+        # Color conversion runs off the event loop; one worker keeps frames in order
+        self._convert_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="frame-convert",
+        )
+
+    # Runtime settings are fixed once the model is loaded, so look them up once
+    @cached_property
     def video_resolution(self) -> tuple[int, int]:
         frame = self._runtime.get_first_frame()
         if frame is None:
             raise ValueError("Failed to load avatar model")
         return frame.shape[1], frame.shape[0]
 
-    @property
+    @cached_property
     def video_fps(self) -> int:
         return self._runtime.settings.FPS
 
-    @property
+    @cached_property
     def audio_sample_rate(self) -> int:
         return self._runtime.settings.INPUT_SAMPLE_RATE
 
@@ -70,17 +79,17 @@ class BithumanVideoGenerator(VideoGenerator):
         return self._stream()
 
     async def _stream(self) -> AsyncGenerator[rtc.VideoFrame | rtc.AudioFrame | AudioSegmentEnd, None]:
+        loop = asyncio.get_running_loop()
         async for frame in self._runtime.run():
             if frame.bgr_image is not None:
-                rgba = cv2.cvtColor(frame.bgr_image, cv2.COLOR_BGR2RGBA)
-                yield rtc.VideoFrame(
-                    width=rgba.shape[1], height=rgba.shape[0],
-                    type=rtc.VideoBufferType.RGBA, data=rgba.tobytes(),
+                yield await loop.run_in_executor(
+                    self._convert_pool, self._to_video_frame, frame.bgr_image,
                 )
 
             if frame.audio_chunk is not None:
+                # AudioFrame copies from any buffer; no intermediate bytes
                 yield rtc.AudioFrame(
-                    data=frame.audio_chunk.bytes,
+                    data=frame.audio_chunk.array.data,
                     sample_rate=frame.audio_chunk.sample_rate,
                     num_channels=1,
                     samples_per_channel=len(frame.audio_chunk.array),
@@ -89,19 +98,44 @@ class BithumanVideoGenerator(VideoGenerator):
             if frame.end_of_speech:
                 yield AudioSegmentEnd()
 
+    def _to_video_frame(self, bgr: np.ndarray) -> rtc.VideoFrame:
+        """Convert a BGR image to I420, the format WebRTC encoders consume natively."""
+        height, width = bgr.shape[:2]
+        if width % 2 or height % 2:
+            # I420 needs even dimensions; fall back to BGRA, which needs no channel swap
+            code = cv2.COLOR_BGR2BGRA
+            buffer_type = rtc.VideoBufferType.BGRA
+            shape = (height, width, 4)
+        else:
+            code = cv2.COLOR_BGR2YUV_I420
+            buffer_type = rtc.VideoBufferType.I420
+            shape = (height * 3 // 2, width)
+
+        if self._frame_buf is None or self._frame_buf.shape != shape:
+            self._frame_buf = np.empty(shape, dtype=np.uint8)
+        cv2.cvtColor(bgr, code, dst=self._frame_buf)
+        # VideoFrame copies the buffer, so it can be reused for the next frame
+        return rtc.VideoFrame(
+            width=width, height=height,
+            type=buffer_type, data=self._frame_buf.data,
+        )
+
     async def stop(self) -> None:
         await self._runtime.stop()
+        self._convert_pool.shutdown(wait=False)
 
 
 async def entrypoint(ctx: JobContext):
-    await ctx.connect()
-
     model = os.getenv("BITHUMAN_MODEL_PATH")
     secret = os.getenv("BITHUMAN_API_SECRET")
     if not model or not secret:
         raise ValueError("Set BITHUMAN_MODEL_PATH and BITHUMAN_API_SECRET")
 
-    runtime = await AsyncBithuman.create(model_path=model, api_secret=secret)
+    # Model load and room connection are independent; do them concurrently
+    runtime, _ = await asyncio.gather(
+        AsyncBithuman.create(model_path=model, api_secret=secret),
+        ctx.connect(),
+    )
     video_gen = BithumanVideoGenerator(runtime)
 
     width, height = video_gen.video_resolution
@@ -16,46 +16,94 @@ import websockets
 from loguru import logger
 
 try:
-    import resampy
     import soundfile as sf
 except ImportError:
-    logger.error("Install deps: pip install soundfile resampy")
+    logger.error("Install deps: pip install soundfile soxr")
     sys.exit(1)
 
+try:
+    import soxr
+except ImportError:
+    soxr = None
+    try:
+        import resampy  # slower fallback resampler
+    except ImportError:
+        logger.error("Install a resampler: pip install soxr")
+        sys.exit(1)
+
 logger.remove()
 logger.add(sys.stdout, level="INFO")
 
 TARGET_SR = 16000
-CHUNK_MS = 100
+CHUNK_MS = 500  # sent as fast as it is read; fewer, larger messages are cheaper
 
 
-async def stream_audio(ws_url: str, audio_file: str):
-    """Load an audio file, resample to 16kHz mono int16, and stream via WebSocket."""
-    audio, sr = sf.read(audio_file)
-
-    # Convert to mono
-    if audio.ndim > 1:
-        audio = np.mean(audio, axis=1)
+def to_pcm(block: np.ndarray, sr: int, resampler, last: bool) -> memoryview:
+    """Downmix, resample and convert one float32 block to 16kHz mono int16 PCM."""
+    # Convert to mono: sum channels into one float32 buffer, then scale it in place
+    if block.shape[1] > 1:
+        channels = block.shape[1]
+        audio = np.add.reduce(block, axis=1)
+        audio *= np.float32(1.0 / channels)
+    else:
+        audio = block[:, 0]
 
     # Resample to 16kHz
-    if sr != TARGET_SR:
-        logger.info(f"Resampling {sr}Hz → {TARGET_SR}Hz")
-        audio = resampy.resample(audio, sr_orig=sr, sr_new=TARGET_SR)
+    if resampler is not None:
+        audio = resampler.resample_chunk(audio, last=last)
+    elif sr != TARGET_SR:
+        # kaiser_fast is plenty for 16 kHz speech and much faster than kaiser_best
+        audio = resampy.resample(
+            audio, sr_orig=sr, sr_new=TARGET_SR, filter="kaiser_fast",
+        )
 
-    # Convert float → int16
-    if audio.dtype in (np.float32, np.float64):
-        audio = np.clip(audio * 32767, -32768, 32767).astype(np.int16)
+    # Convert float → int16, scaling in place rather than through temporaries
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+    np.multiply(audio, 32767, out=audio)
+    np.clip(audio, -32768, 32767, out=audio)
+    return memoryview(audio.astype(np.int16)).cast("B")
 
-    chunk_samples = TARGET_SR * CHUNK_MS // 1000
 
-    async with websockets.connect(ws_url) as ws:
-        logger.info(f"Streaming {len(audio) / TARGET_SR:.1f}s of audio")
-
-        for i in range(0, len(audio), chunk_samples):
-            await ws.send(audio[i : i + chunk_samples].tobytes())
-
-        await ws.send(json.dumps({"type": "end"}))
-        logger.info("Done")
+async def stream_audio(ws_url: str, audio_file: str):
+    """Stream an audio file over WebSocket as 16kHz mono int16, block by block."""
+    chunk_bytes = TARGET_SR * CHUNK_MS // 1000 * 2
+
+    with sf.SoundFile(audio_file) as f:
+        sr = f.samplerate
+        resampler = None
+        if sr == TARGET_SR:
+            blocksize = sr * CHUNK_MS // 1000
+        elif soxr is not None:
+            logger.info(f"Resampling {sr}Hz → {TARGET_SR}Hz")
+            # Stateful resampler, so block edges join without artifacts
+            resampler = soxr.ResampleStream(
+                sr, TARGET_SR, 1, dtype="float32", quality="HQ",
+            )
+            blocksize = sr * CHUNK_MS // 1000
+        else:
+            logger.info(f"Resampling {sr}Hz → {TARGET_SR}Hz")
+            # resampy keeps no state between calls, so resample the whole file at once
+            blocksize = f.frames
+
+        # PCM doesn't deflate usefully; skip permessage-deflate
+        async with websockets.connect(ws_url, compression=None) as ws:
+            logger.info(f"Streaming {f.frames / sr:.1f}s of audio")
+
+            async def send(pcm: memoryview):
+                for i in range(0, len(pcm), chunk_bytes):
+                    await ws.send(pcm[i : i + chunk_bytes])
+
+            # Hold one block back so the final one can flush the resampler
+            pending = None
+            for block in f.blocks(blocksize, dtype="float32", always_2d=True):
+                if pending is not None:
+                    await send(to_pcm(pending, sr, resampler, last=False))
+                pending = block
+            if pending is not None:
+                await send(to_pcm(pending, sr, resampler, last=True))
+
+            await ws.send(json.dumps({"type": "end"}))
+            logger.info("Done")
 
 
 async def send_interrupt(ws_url: str):
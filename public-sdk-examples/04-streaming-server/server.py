@@ -13,6 +13,7 @@ import json
 import os
 import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 import numpy as np
@@ -22,7 +23,11 @@ from livekit import api, rtc
 from loguru import logger
 
 from bithuman import AsyncBithuman
-from bithuman.utils import FPSController
+
+try:
+    import uvloop  # optional: lower per-callback overhead than the default loop
+except ImportError:
+    uvloop = None
 
 load_dotenv()
 logger.remove()
@@ -46,11 +51,12 @@ class AvatarStreamingServer:
 
         self._room = rtc.Room()
         self._av_sync = None
-        self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue()
-        self._running = False
+        self._bgra: np.ndarray | None = None  # reused color-conversion target
+        self._convert_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="frame-convert",
+        )
 
     async def start(self):
-        self._running = True
         await self.runtime.start()
         width, height = self.runtime.get_frame_size()
 
@@ -86,68 +92,84 @@ class AvatarStreamingServer:
             video_fps=VIDEO_FPS, video_queue_size_ms=100,
         )
 
-        # Start WebSocket server + audio processing
-        ws_server = await websockets.serve(self._handle_ws, "0.0.0.0", self.ws_port)
+        # Start WebSocket server; raw PCM doesn't deflate usefully, so skip compression
+        ws_server = await websockets.serve(
+            self._handle_ws, "0.0.0.0", self.ws_port, compression=None,
+        )
         logger.info(f"WebSocket server on port {self.ws_port}")
 
-        audio_task = asyncio.create_task(self._process_audio())
         try:
             await self._run_avatar()
         finally:
-            audio_task.cancel()
             ws_server.close()
             if self._av_sync:
                 await self._av_sync.aclose()
             await self._room.disconnect()
             await self.runtime.stop()
+            self._convert_pool.shutdown(wait=False)
 
     async def _handle_ws(self, ws):
         """Handle a single WebSocket client."""
         logger.info("Client connected")
         try:
             async for msg in ws:
-                if isinstance(msg, bytes):
-                    await self._audio_queue.put(msg)
-                elif isinstance(msg, str):
-                    data = json.loads(msg)
-                    if data.get("type") == "interrupt":
-                        self.runtime.interrupt()
-                    elif data.get("type") == "end":
-                        await self.runtime.flush()
+                if type(msg) is bytes:
+                    # Audio is nearly every message: push it straight to the runtime,
+                    # which buffers input itself
+                    await self.runtime.push_audio(
+                        msg, AUDIO_SAMPLE_RATE, last_chunk=False,
+                    )
+                    continue
+
+                # Text frames are the rare control messages
+                msg_type = json.loads(msg).get("type")
+                if msg_type == "interrupt":
+                    self.runtime.interrupt()
+                elif msg_type == "end":
+                    await self.runtime.flush()
         except websockets.exceptions.ConnectionClosed:
             pass
         logger.info("Client disconnected")
 
-    async def _process_audio(self):
-        """Forward queued audio bytes to the bitHuman runtime."""
-        while self._running:
-            audio = await self._audio_queue.get()
-            await self.runtime.push_audio(audio, AUDIO_SAMPLE_RATE, last_chunk=False)
-
     async def _run_avatar(self):
         """Main loop: consume bitHuman frames and push to LiveKit."""
-        fps = FPSController(target_fps=VIDEO_FPS)
+        loop = asyncio.get_running_loop()
+        frame_interval = 1.0 / VIDEO_FPS
+        next_deadline = loop.time()
 
         async for frame in self.runtime.run():
-            sleep_time = fps.wait_next_frame(sleep=False)
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+            now = loop.time()
+            if now < next_deadline:
+                await asyncio.sleep(next_deadline - now)
+            # Advance from the deadline rather than from now so sleep overshoot
+            # doesn't accumulate; after a stall, restart one interval from now
+            next_deadline = max(next_deadline, now) + frame_interval
 
             if frame.has_image:
-                rgba = cv2.cvtColor(frame.bgr_image, cv2.COLOR_BGR2RGBA)
-                await self._av_sync.push(rtc.VideoFrame(
-                    width=rgba.shape[1], height=rgba.shape[0],
-                    type=rtc.VideoBufferType.RGBA, data=rgba.tobytes(),
-                ))
+                video_frame = await loop.run_in_executor(
+                    self._convert_pool, self._to_video_frame, frame.bgr_image,
+                )
+                await self._av_sync.push(video_frame)
 
             if frame.audio_chunk:
+                # AudioFrame copies from any buffer; no intermediate bytes
                 await self._av_sync.push(rtc.AudioFrame(
-                    data=frame.audio_chunk.array.tobytes(),
+                    data=frame.audio_chunk.array.data,
                     sample_rate=AUDIO_SAMPLE_RATE, num_channels=1,
                     samples_per_channel=len(frame.audio_chunk.array),
                 ))
 
-            fps.update()
+    def _to_video_frame(self, bgr: np.ndarray) -> rtc.VideoFrame:
+        """Convert a BGR image to a BGRA VideoFrame (runs on the convert worker)."""
+        height, width = bgr.shape[:2]
+        if self._bgra is None or self._bgra.shape[:2] != (height, width):
+            self._bgra = np.empty((height, width, 4), dtype=np.uint8)
+        # BGRA keeps the runtime's channel order, so this only appends alpha
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA, dst=self._bgra)
+        return rtc.VideoFrame(
+            width=width, height=height,
+            type=rtc.VideoBufferType.BGRA, data=self._bgra.data,
+        )
 
 
 async def main():
@@ -178,4 +200,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -8,6 +8,7 @@ Usage:
 """
 
 import asyncio
+import contextlib
 import logging
 import os
 from collections.abc import AsyncIterator
@@ -24,7 +25,6 @@ from livekit.plugins import openai
 from numpy.typing import NDArray
 
 from bithuman import AsyncBithuman
-from bithuman.utils import FPSController
 from fastrtc import AsyncAudioVideoStreamHandler, AudioEmitType, Stream, VideoEmitType, wait_for_item
 
 load_dotenv()
@@ -55,9 +55,14 @@ class BitHumanHandler(AsyncAudioVideoStreamHandler):
         self.video_queue: asyncio.Queue[NDArray[np.uint8]] = asyncio.Queue()
         self.audio_queue: asyncio.Queue[tuple[int, NDArray[np.int16]]] = asyncio.Queue()
         self.runtime: AsyncBithuman | None = None
+        self._pipeline: asyncio.Future | None = None
         self.runtime_ready = asyncio.Event()
-        self.fps_controller = FPSController(target_fps=25)
         self.pushed_duration: float = 0
+        # Scratch buffers for mic float -> int16 conversion, grown on demand
+        self._scaled = np.empty(0, dtype=np.float32)
+        self._scaled_int16 = np.empty(0, dtype=np.int16)
+        # Shown while no avatar frame is ready; emitted read-only, so one copy suffices
+        self._blank_frame = np.zeros((768, 1280, 3), dtype=np.uint8)
 
     @utils.log_exceptions(logger=logger)
     async def start_up(self):
@@ -81,7 +86,11 @@ class BitHumanHandler(AsyncAudioVideoStreamHandler):
         await self.runtime.start()
         self.runtime_ready.set()
 
-        await asyncio.gather(self._generate_frames(), self._forward_agent_audio())
+        # Kept so shutdown can stop it; FastRTC does not cancel start_up on disconnect
+        self._pipeline = asyncio.gather(
+            self._generate_frames(), self._forward_agent_audio(),
+        )
+        await self._pipeline
 
     def _make_audio_input(self) -> AsyncIterator[rtc.AudioFrame]:
         async def gen():
@@ -90,17 +99,23 @@ class BitHumanHandler(AsyncAudioVideoStreamHandler):
         return gen()
 
     async def _generate_frames(self):
+        loop = asyncio.get_running_loop()
+        frame_interval = 1.0 / 25
+        next_deadline = loop.time()
+
         async for frame in self.runtime.run():
             if frame.audio_chunk:
                 await self.audio_queue.put((frame.audio_chunk.sample_rate, frame.audio_chunk.data))
                 self.pushed_duration += frame.audio_chunk.duration
 
             if frame.has_image:
-                sleep = self.fps_controller.wait_next_frame(sleep=False)
-                if sleep > 0:
-                    await asyncio.sleep(sleep)
+                now = loop.time()
+                if now < next_deadline:
+                    await asyncio.sleep(next_deadline - now)
+                # Absolute deadlines keep overshoot from accumulating; after a stall,
+                # the next frame is one interval out rather than due at once
+                next_deadline = max(next_deadline, now) + frame_interval
                 await self.video_queue.put(frame.bgr_image)
-                self.fps_controller.update()
 
             if frame.end_of_speech and self.pushed_duration > 0:
                 self.agent_audio_queue.notify_playback_finished(self.pushed_duration, interrupted=False)
@@ -122,7 +137,7 @@ class BitHumanHandler(AsyncAudioVideoStreamHandler):
     # FastRTC hooks
     async def video_emit(self) -> VideoEmitType:
         frame = await wait_for_item(self.video_queue)
-        return frame if frame is not None else np.zeros((768, 1280, 3), dtype=np.uint8)
+        return frame if frame is not None else self._blank_frame
 
     async def video_receive(self, frame: NDArray[np.uint8]):
         pass
@@ -133,15 +148,34 @@ class BitHumanHandler(AsyncAudioVideoStreamHandler):
     async def receive(self, frame: tuple[int, NDArray[np.int16]]):
         await self.runtime_ready.wait()
         sr, array = frame
-        if array.ndim == 2:
-            array = array[0]
+        # No copy for the usual contiguous mono frame
+        array = np.ascontiguousarray(array[0] if array.ndim == 2 else array)
         if array.dtype == np.float32:
-            array = (array * np.iinfo(np.int16).max).astype(np.int16)
-        await self.input_audio_queue.put(
-            rtc.AudioFrame(data=array.tobytes(), sample_rate=sr, num_channels=1, samples_per_channel=len(array))
-        )
+            array = self._to_int16(array)
+        # AudioFrame copies the buffer, so no intermediate bytes are needed
+        await self.input_audio_queue.put(rtc.AudioFrame(
+            data=array.data, sample_rate=sr,
+            num_channels=1, samples_per_channel=len(array),
+        ))
+
+    def _to_int16(self, samples: NDArray[np.float32]) -> NDArray[np.int16]:
+        """Scale float mic audio to saturated int16 without per-frame allocations."""
+        n = len(samples)
+        if len(self._scaled) < n:
+            self._scaled = np.empty(n, dtype=np.float32)
+            self._scaled_int16 = np.empty(n, dtype=np.int16)
+        scaled = self._scaled[:n]
+        np.multiply(samples, 32767, out=scaled)
+        np.clip(scaled, -32768, 32767, out=scaled)
+        np.copyto(self._scaled_int16[:n], scaled, casting="unsafe")
+        return self._scaled_int16[:n]
 
     async def shutdown(self):
+        if self._pipeline:
+            self._pipeline.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._pipeline
+        self.agent_audio_queue.off("clear_buffer", self._on_interrupt)
         if self.runtime:
             await self.runtime.flush()
             await self.runtime.stop()